@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the FinScope helpers.
+
+Each subcommand maps onto an existing script and is only imported when it
+runs, so `--help` and the lightweight subcommands start without pandas, NumPy
+or pyreadstat. Importing this module has no side effects.
+
+Usage:
+    python finscope.py --help
+    python finscope.py harmonise --long-output outputs/finscope_harmonised_long.csv
+    python finscope.py clean 2019 --keep-columns H3a_13 i1_10
+    python finscope.py summary
+    python finscope.py codebook --years 2015 2016
+    python finscope.py site-data --input outputs/finscope_harmonised.csv
+    python finscope.py search funeral policy
+"""
+
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# Subcommand -> (script path relative to the repo root, one-line help).
+SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "harmonise": ("scripts/harmonise.py", "Create the harmonised FinScope series from the mappings."),
+    "clean": ("scripts/clean_year.py", "Export a single processed FinScope wave."),
+    "summary": ("scripts/summary_table.py", "Summarise the harmonised FinScope dataset."),
+    "codebook": ("generate_codebook.py", "Generate per-year codebooks from the survey metadata."),
+    "site-data": ("scripts/build_homepage_summary.py", "Build the homepage chart JSON for the docs site."),
+    "search": ("scripts/search_codebook.py", "Search the codebooks for equivalent questions across years."),
+}
+
+
+def load_subcommand(name: str):
+    """Import the script behind a subcommand and return its module."""
+    script_path = REPO_ROOT / SUBCOMMANDS[name][0]
+    # Scripts import project-level utilities such as `utils`.
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    spec = importlib.util.spec_from_file_location(f"finscope_{script_path.stem}", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="finscope",
+        usage="%(prog)s [-h] subcommand ...",
+        description="Harmonise and inspect FinScope Consumer South Africa surveys.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="subcommands:\n"
+        + "\n".join(f"  {name:<11} {help_text}" for name, (_path, help_text) in SUBCOMMANDS.items())
+        + "\n\nRun `finscope <subcommand> --help` for subcommand options.",
+    )
+    parser.add_argument("command", choices=list(SUBCOMMANDS), metavar="subcommand", help="Helper to run.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    # Only the subcommand is parsed here; everything after it, `--help` included,
+    # belongs to the subcommand's own parser.
+    args = parser.parse_args(argv[:1])
+    module = load_subcommand(args.command)
+    # Subcommand parsers take their usage line from argv[0]; restore it for library callers.
+    prog = sys.argv[0]
+    sys.argv[0] = f"finscope {args.command}"
+    try:
+        module.main(argv[1:])
+    finally:
+        sys.argv[0] = prog
+
+
+if __name__ == "__main__":
+    main()
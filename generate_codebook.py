@@ -1,38 +1,76 @@
-import os
+#!/usr/bin/env python3
+"""
+Write a codebook CSV (variable names, labels and value labels) for each FinScope wave.
+
+Usage:
+    python generate_codebook.py
+    python generate_codebook.py --years 2015 2016 --output-dir codebook
+"""
+
+import argparse
 import json
-import pandas as pd
-import pyreadstat
-from dotenv import load_dotenv
-from pathlib import Path 
-from utils import get_finscope_path, load_finscope_data
-
-# Create the codebook folder if it doesn't exist
-codebook_folder = Path("codebook")
-codebook_folder.mkdir(exist_ok=True)
-
-# Loop through years 2005 to 2019 to load data and create codebooks
-for year in range(2005, 2020):
-    try:
-        df, metadata = load_finscope_data(year)
-        
-        # Create a DataFrame for the codebook
-        df_m = pd.DataFrame()
-        df_m['name'] = metadata.column_names
-        df_m['label'] = metadata.column_labels
-
-        variable_value_labels = getattr(metadata, "variable_value_labels", None)
-        if variable_value_labels:
-            df_m['value_labels'] = [
-                json.dumps(variable_value_labels.get(name, {}))
-                if variable_value_labels.get(name)
-                else ""
-                for name in metadata.column_names
-            ]
-        
-        # Save the codebook as a CSV file
-        codebook_path = codebook_folder / f"codebook_{year}.csv"
-        df_m.to_csv(codebook_path, index=False)
-        print(f"Codebook for {year} saved to {codebook_path}")
-    except Exception as e:
-        print(f"Failed to process data for {year}: {e}")
+from pathlib import Path
+from typing import List, Optional
+
+from utils import load_finscope_data
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate per-year codebooks from the FinScope metadata.")
+    parser.add_argument(
+        "--years",
+        nargs="*",
+        type=int,
+        default=list(range(2005, 2020)),
+        help="Survey years to process (defaults to 2005-2019).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=REPO_ROOT / "codebook",
+        help="Directory to write codebook_{year}.csv files.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    # Create the codebook folder if it doesn't exist
+    codebook_folder = args.output_dir
+    codebook_folder.mkdir(parents=True, exist_ok=True)
+
+    # Loop through the requested years to load data and create codebooks
+    for year in args.years:
+        try:
+            df, metadata = load_finscope_data(year)
+
+            # Create a DataFrame for the codebook
+            df_m = pd.DataFrame()
+            df_m['name'] = metadata.column_names
+            df_m['label'] = metadata.column_labels
+
+            variable_value_labels = getattr(metadata, "variable_value_labels", None)
+            if variable_value_labels:
+                df_m['value_labels'] = [
+                    json.dumps(variable_value_labels.get(name, {}))
+                    if variable_value_labels.get(name)
+                    else ""
+                    for name in metadata.column_names
+                ]
+
+            # Save the codebook as a CSV file
+            codebook_path = codebook_folder / f"codebook_{year}.csv"
+            df_m.to_csv(codebook_path, index=False)
+            print(f"Codebook for {year} saved to {codebook_path}")
+        except Exception as e:
+            print(f"Failed to process data for {year}: {e}")
+
 
+if __name__ == "__main__":
+    main()
@@ -104,7 +104,7 @@ def write_summary(summary: Dict, output_path: Path) -> None:
     print(f"Wrote homepage summary JSON to {output_path}")
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build homepage summary data for the docs chart.")
     parser.add_argument("--input", type=Path, required=True, help="Path to the harmonised wide CSV.")
     parser.add_argument(
@@ -119,11 +119,11 @@ def parse_args() -> argparse.Namespace:
         default=Path("docs/assets/data/harmonised-summary.json"),
         help="Destination for the generated JSON file.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
     summary = build_summary(args.input, args.mapping_file)
     write_summary(summary, args.output)
 
@@ -7,12 +7,15 @@ The script intentionally stays simple so domain experts can tweak it:
     python scripts/clean_year.py 2019 --keep-columns H3a_13 i1_10 --output-format parquet
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Allow importing project-level utilities when running the script directly
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -72,9 +75,9 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     df, metadata = load_finscope_data(args.year)
     print(f"Loaded FinScope {args.year}: {len(df):,} rows, {len(df.columns)} columns")
@@ -7,13 +7,15 @@ Usage:
     python scripts/harmonise.py --mapping-file mappings/harmonised_questions.csv --output outputs/finscope_harmonised.csv
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
-import numpy as np
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Allow importing project-level utilities when running the script directly
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -25,6 +27,8 @@ from utils import load_finscope_data  # noqa: E402
 
 def parse_codes(raw: str) -> List:
     """Split a pipe- or semicolon-delimited list of codes and cast numerics when possible."""
+    import pandas as pd
+
     if pd.isna(raw) or raw == "":
         return []
     codes = []
@@ -106,6 +110,8 @@ def build_indicator(df: pd.DataFrame, row: pd.Series) -> pd.Series:
 
 def load_weights(weights_path: Path) -> Dict[int, str]:
     """Read the year-to-weight-variable mapping CSV."""
+    import pandas as pd
+
     weights = pd.read_csv(weights_path)
     if "year" not in weights or "weight_var" not in weights:
         raise ValueError("Weight metadata must include 'year' and 'weight_var' columns.")
@@ -119,6 +125,9 @@ def load_weights(weights_path: Path) -> Dict[int, str]:
 
 def weighted_mean(series: pd.Series, weights: pd.Series) -> float:
     """Return a weighted mean handling missing values gracefully."""
+    import numpy as np
+    import pandas as pd
+
     aligned = pd.concat([series, weights], axis=1).dropna()
     if aligned.empty:
         return float("nan")
@@ -136,6 +145,8 @@ def harmonise(
     long_output_path: Path | None = None,
 ) -> pd.DataFrame:
     """Create harmonised indicators for each year and persist wide/long outputs."""
+    import pandas as pd
+
     mapping = pd.read_csv(mapping_path)
     weight_map = load_weights(weights_path)
 
@@ -251,9 +262,9 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     harmonise(
         mapping_path=args.mapping_file,
         weights_path=args.weights_file,
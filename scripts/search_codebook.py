@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Search the per-year codebooks for candidate variables across FinScope waves.
+
+The first query builds a persisted inverted index over variable names, labels
+and value labels from `codebook/codebook_{year}.csv` (see `python finscope.py codebook`).
+Later queries only re-index waves whose codebook changed on disk.
+
+Examples:
+    python scripts/search_codebook.py funeral policy
+    python scripts/search_codebook.py "funeral policy" --years 2015 2016 --limit 3
+    python scripts/search_codebook.py --rebuild
+"""
+
+import argparse
+import bisect
+import csv
+import difflib
+import json
+import math
+import os
+import pickle
+import re
+import tempfile
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+INDEX_VERSION = 2
+CODEBOOK_PATTERN = re.compile(r"codebook_(\d{4})\.csv$")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Matches in the variable name outrank label matches, which outrank value labels.
+# Weights fit in two bits so they can be packed alongside the variable index.
+FIELD_WEIGHTS = {"name": 3, "label": 2, "value": 1}
+PREFIX_WEIGHT = 0.8
+FUZZY_CUTOFF = 0.8
+STOPWORDS = {
+    "a", "an", "and", "are", "at", "by", "do", "does", "for", "from", "have", "in", "is",
+    "it", "of", "on", "or", "the", "to", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case and split free text into search tokens, dropping stopwords."""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOPWORDS]
+
+
+def name_parts(name: str) -> List[str]:
+    """Split a variable name into its parts (`H3a_13` -> `h3a`, `13`); no stopwords apply."""
+    return TOKEN_PATTERN.findall(str(name).lower())
+
+
+def parse_value_labels(raw: str) -> Dict[str, str]:
+    """Decode the JSON value-label column written by `python finscope.py codebook`."""
+    if not raw:
+        return {}
+    try:
+        labels = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(labels, dict):
+        return {}
+    return {format_code(code): str(label) for code, label in labels.items()}
+
+
+def format_code(code) -> str:
+    """Render Stata codes such as `3.0` as `3` for display."""
+    try:
+        number = float(code)
+    except (TypeError, ValueError):
+        return str(code)
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+def find_codebooks(codebook_dir: Path) -> Dict[int, Path]:
+    """Return the codebook CSV for each year found in `codebook_dir`."""
+    codebooks: Dict[int, Path] = {}
+    if not codebook_dir.exists():
+        return codebooks
+    for path in codebook_dir.iterdir():
+        match = CODEBOOK_PATTERN.match(path.name)
+        if match:
+            codebooks[int(match.group(1))] = path
+    return dict(sorted(codebooks.items()))
+
+
+def file_signature(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def index_wave(codebook_path: Path) -> Dict:
+    """
+    Build the variable list and postings for one wave.
+
+    Postings map each token to packed `(variable << 2) | weight` integers, and
+    variables are stored as JSON strings that are only decoded for the top hits,
+    so a wave unpickles without creating an object per hit.
+    """
+    variables: List[str] = []
+    postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+
+    with codebook_path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            name = (row.get("name") or "").strip()
+            if not name:
+                continue
+            label = (row.get("label") or "").strip()
+            value_labels = parse_value_labels(row.get("value_labels") or "")
+            var_idx = len(variables)
+            variables.append(json.dumps([name, label, value_labels], separators=(",", ":")))
+
+            # The full name (`q67a`) is a name match; its parts (`h3a_13` -> `h3a`, `13`)
+            # count like label words so an exact name still ranks first.
+            fields = (
+                ("name", [name.lower()]),
+                ("label", tokenize(label) + name_parts(name)),
+                ("value", [token for text in value_labels.values() for token in tokenize(text)]),
+            )
+            for field, tokens in fields:
+                weight = FIELD_WEIGHTS[field]
+                for token in tokens:
+                    # Keep the strongest field a token appears in for each variable.
+                    if postings[token].get(var_idx, 0) < weight:
+                        postings[token][var_idx] = weight
+
+    return {
+        **file_signature(codebook_path),
+        "variables": variables,
+        "postings": {
+            token: array("I", [(idx << 2) | weight for idx, weight in hits.items()]).tobytes()
+            for token, hits in postings.items()
+        },
+    }
+
+
+def empty_manifest() -> Dict:
+    return {"version": INDEX_VERSION, "waves": {}, "token_years": {}, "vocabulary": {}}
+
+
+def read_pickle(path: Path) -> Optional[Dict]:
+    try:
+        with path.open("rb") as handle:
+            data = pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_pickle(data: Dict, path: Path) -> None:
+    """Write atomically so concurrent searches never see (or clobber) a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as handle:
+        pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(handle.name, path)
+
+
+def load_manifest(index_dir: Path) -> Dict:
+    manifest = read_pickle(index_dir / "manifest.pickle")
+    if manifest is None or manifest.get("version") != INDEX_VERSION:
+        return empty_manifest()
+    return manifest
+
+
+def wave_path(index_dir: Path, year: int) -> Path:
+    return index_dir / f"wave_{year}.pickle"
+
+
+def load_wave(index_dir: Path, year: int, entry: Dict, codebook_dir: Path) -> Dict:
+    """Load one wave's postings, re-indexing it if the file is missing or out of step with the manifest."""
+    path = wave_path(index_dir, year)
+    wave = read_pickle(path)
+    if wave is None or any(wave.get(key) != entry[key] for key in ("mtime_ns", "size")):
+        wave = index_wave(codebook_dir / entry["source"])
+        write_pickle(wave, path)
+    return wave
+
+
+def refresh_index(codebook_dir: Path, index_dir: Path, rebuild: bool = False) -> Tuple[Dict, List[int]]:
+    """
+    Bring the persisted index in line with the codebooks on disk.
+
+    The index is a directory holding one pickle per wave plus a small manifest
+    with each wave's file signature and the token -> years vocabulary. Only
+    waves whose codebook was added, removed or modified (by mtime or size) are
+    re-indexed. Returns the manifest and the list of years that changed.
+    """
+    codebooks = find_codebooks(codebook_dir)
+    if not codebooks:
+        return empty_manifest(), []
+
+    manifest = empty_manifest() if rebuild else load_manifest(index_dir)
+    waves = manifest["waves"]
+    changed: List[int] = [year for year in waves if year not in codebooks]
+    new_tokens: Dict[int, Iterable[str]] = {}
+
+    for year, path in codebooks.items():
+        signature = file_signature(path)
+        stored = waves.get(year)
+        if stored and all(stored.get(key) == value for key, value in signature.items()):
+            continue
+        wave = index_wave(path)
+        write_pickle(wave, wave_path(index_dir, year))
+        new_tokens[year] = wave["postings"].keys()
+        changed.append(year)
+
+    if changed or not (index_dir / "manifest.pickle").exists():
+        for year in changed:
+            waves.pop(year, None)
+            if year not in codebooks:
+                wave_path(index_dir, year).unlink(missing_ok=True)
+        for year, path in codebooks.items():
+            if year in new_tokens:
+                waves[year] = {"source": path.name, **file_signature(path)}
+        manifest["token_years"] = update_token_years(manifest["token_years"], set(changed), new_tokens)
+        manifest["vocabulary"] = build_vocabulary(manifest["token_years"])
+        write_pickle(manifest, index_dir / "manifest.pickle")
+    return manifest, sorted(changed)
+
+
+def update_token_years(
+    token_years: Dict[str, Tuple[int, ...]], changed: set, new_tokens: Dict[int, Iterable[str]]
+) -> Dict[str, Tuple[int, ...]]:
+    """Drop changed waves from the token -> years map, then add the tokens of re-indexed waves."""
+    updated: Dict[str, set] = defaultdict(set)
+    for token, years in token_years.items():
+        kept = [year for year in years if year not in changed]
+        if kept:
+            updated[token].update(kept)
+    for year, tokens in new_tokens.items():
+        for token in tokens:
+            updated[token].add(year)
+    # Share identical year tuples so the pickled manifest stays small and quick to load.
+    shared: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+    return {token: shared.setdefault(tuple(sorted(years)), tuple(sorted(years))) for token, years in updated.items()}
+
+
+def build_vocabulary(token_years: Dict[str, Tuple[int, ...]]) -> Dict[str, List[str]]:
+    """Bucket every indexed token by first character to keep fuzzy matching cheap."""
+    vocabulary: Dict[str, List[str]] = defaultdict(list)
+    for token in token_years:
+        vocabulary[token[:1]].append(token)
+    return {initial: sorted(tokens) for initial, tokens in vocabulary.items()}
+
+
+def expand_token(token: str, vocabulary: Dict[str, List[str]]) -> Dict[str, float]:
+    """Map a query token to indexed tokens: exact, prefix and fuzzy (typo) matches."""
+    bucket = vocabulary.get(token[:1], [])
+    matches: Dict[str, float] = {}
+    position = bisect.bisect_left(bucket, token)
+    if position < len(bucket) and bucket[position] == token:
+        matches[token] = 1.0
+    if len(token) >= 3:
+        for candidate in bucket[position:]:
+            if not candidate.startswith(token):
+                break
+            matches.setdefault(candidate, PREFIX_WEIGHT)
+    if not matches and len(token) >= 4:
+        for candidate in difflib.get_close_matches(token, bucket, n=3, cutoff=FUZZY_CUTOFF):
+            matches[candidate] = difflib.SequenceMatcher(None, token, candidate).ratio() * PREFIX_WEIGHT
+    return matches
+
+
+def expand_query(query: str, vocabulary: Dict[str, List[str]]) -> List[Dict[str, float]]:
+    """
+    Expand each query term into the indexed tokens it matches.
+
+    Words that look like variable names (containing `_` or a digit) are first
+    matched whole against the names, so `q12_a` finds `Q12_a` rather than
+    every `Q12_*`; only if that fails are they split into name parts.
+    """
+    expansions: List[Dict[str, float]] = []
+    seen = set()
+    for word in query.lower().split():
+        if "_" in word or any(char.isdigit() for char in word):
+            whole = "_".join(TOKEN_PATTERN.findall(word))
+            matches = expand_token(whole, vocabulary) if whole else {}
+            tokens = [] if matches else name_parts(word)
+            if matches and whole not in seen:
+                seen.add(whole)
+                expansions.append(matches)
+        else:
+            tokens = tokenize(word)
+        for token in tokens:
+            if token not in seen:
+                seen.add(token)
+                expansions.append(expand_token(token, vocabulary))
+    return expansions
+
+
+def search_wave(wave: Dict, expansions: List[Dict[str, float]], limit: int) -> List[Dict]:
+    """Rank the variables of a single wave against the expanded query tokens."""
+    postings = wave["postings"]
+    variables = wave["variables"]
+    scores: Dict[int, float] = defaultdict(float)
+    matched: Dict[int, int] = defaultdict(int)
+    n_variables = max(len(variables), 1)
+
+    for terms in expansions:
+        best: Dict[int, float] = {}
+        for term, closeness in terms.items():
+            packed = postings.get(term)
+            if not packed:
+                continue
+            hits = array("I")
+            hits.frombytes(packed)
+            idf = math.log(1 + n_variables / len(hits))
+            for hit in hits:
+                var_idx = hit >> 2
+                score = closeness * (hit & 3) * idf
+                if score > best.get(var_idx, 0.0):
+                    best[var_idx] = score
+        for var_idx, score in best.items():
+            scores[var_idx] += score
+            matched[var_idx] += 1
+
+    # Favour variables that cover every query term over ones that repeat a single term.
+    ranked = sorted(
+        ((score * (matched[var_idx] / len(expansions)) ** 2, var_idx) for var_idx, score in scores.items()),
+        key=lambda item: (-item[0], item[1]),
+    )
+
+    query_terms = {term for terms in expansions for term in terms}
+    results = []
+    for score, var_idx in ranked[:limit]:
+        name, label, value_labels = json.loads(variables[var_idx])
+        codes = {code: text for code, text in value_labels.items() if query_terms.intersection(tokenize(text))}
+        results.append({"name": name, "label": label, "score": round(score, 3), "codes": codes})
+    return results
+
+
+def query_index(
+    manifest: Dict,
+    index_dir: Path,
+    codebook_dir: Path,
+    query: str,
+    years: Optional[Iterable[int]] = None,
+    limit: int = 5,
+) -> Dict[int, List[Dict]]:
+    """Rank candidates per year, loading only the requested waves that contain a matching token."""
+    expansions = [terms for terms in expand_query(query, manifest["vocabulary"]) if terms]
+    if not expansions:
+        return {}
+
+    candidate_years = {
+        year for terms in expansions for term in terms for year in manifest["token_years"].get(term, ())
+    }
+    if years:
+        candidate_years &= {int(year) for year in years}
+
+    results: Dict[int, List[Dict]] = {}
+    for year in sorted(candidate_years):
+        wave = load_wave(index_dir, year, manifest["waves"][year], codebook_dir)
+        hits = search_wave(wave, expansions, limit)
+        if hits:
+            results[year] = hits
+    return results
+
+
+def search(
+    query: str,
+    codebook_dir: Path = REPO_ROOT / "codebook",
+    index_dir: Optional[Path] = None,
+    years: Optional[Iterable[int]] = None,
+    limit: int = 5,
+) -> Dict[int, List[Dict]]:
+    """Return the top `limit` candidate variables per year for a free-text query."""
+    index_dir = index_dir or codebook_dir / "search_index"
+    manifest, _changed = refresh_index(codebook_dir, index_dir)
+    if not manifest["waves"]:
+        raise FileNotFoundError(f"No codebook_{{year}}.csv files found in {codebook_dir}")
+    return query_index(manifest, index_dir, codebook_dir, query, years=years, limit=limit)
+
+
+def print_results(results: Dict[int, List[Dict]]) -> None:
+    if not results:
+        print("No matching variables found.")
+        return
+    for year, hits in results.items():
+        print(f"{year}:")
+        for hit in hits:
+            print(f"  {hit['name']:<12} {hit['score']:>7.2f}  {hit['label']}")
+            if hit["codes"]:
+                codes = "; ".join(f"{code}={text}" for code, text in hit["codes"].items())
+                print(f"  {'':<12} {'':>7}  codes: {codes}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Search FinScope codebooks for equivalent questions across years.")
+    parser.add_argument("query", nargs="*", help="Free-text query, e.g. funeral policy.")
+    parser.add_argument(
+        "--years",
+        nargs="*",
+        type=int,
+        default=None,
+        help="Restrict results to these survey years.",
+    )
+    parser.add_argument("--limit", type=int, default=5, help="Maximum candidates to show per year.")
+    parser.add_argument(
+        "--codebook-dir",
+        type=Path,
+        default=REPO_ROOT / "codebook",
+        help="Directory containing codebook_{year}.csv files.",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Directory for the persisted search index (defaults to <codebook-dir>/search_index).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every wave from scratch.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    index_dir = args.index or args.codebook_dir / "search_index"
+
+    manifest, changed = refresh_index(args.codebook_dir, index_dir, rebuild=args.rebuild)
+    if not manifest["waves"]:
+        parser.error(f"No codebook_{{year}}.csv files found in {args.codebook_dir}; run `python finscope.py codebook` first.")
+    if args.rebuild or not args.query:
+        print(f"Indexed {len(manifest['waves'])} waves ({len(changed)} updated) in {index_dir}")
+        if not args.query:
+            return
+
+    results = query_index(
+        manifest,
+        index_dir,
+        args.codebook_dir,
+        " ".join(args.query),
+        years=args.years,
+        limit=args.limit,
+    )
+    if args.json:
+        print(json.dumps({str(year): hits for year, hits in results.items()}, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
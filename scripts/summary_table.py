@@ -9,8 +9,7 @@ Examples:
 
 import argparse
 from pathlib import Path
-
-import pandas as pd
+from typing import List, Optional
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -32,9 +31,12 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # Imported here so `--help` and the `finscope` CLI start without pandas.
+    import pandas as pd
 
     table = pd.read_csv(args.input)
     table_sorted = table.sort_values("year").reset_index(drop=True)
@@ -1,9 +1,29 @@
 import os
-from dotenv import load_dotenv 
-import pyreadstat
 from pathlib import Path 
 
-load_dotenv()
+
+def get_data_path():
+    """
+    Returns the base directory for FinScope data from the DATA_PATH environment variable.
+
+    The `.env` file is only read here, on first use, so importing this module
+    stays cheap and free of side effects.
+
+    Returns:
+        Path: Path object pointing to the shared data directory
+
+    Raises:
+        ValueError: If DATA_PATH is not set in the environment or `.env` file
+    """
+    if not os.getenv("DATA_PATH"):
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    data_path = os.getenv("DATA_PATH")
+    if not data_path:
+        raise ValueError("DATA_PATH environment variable is not set.")
+    return Path(data_path)
+
 
 def get_finscope_path(year):
     """
@@ -18,9 +38,7 @@ def get_finscope_path(year):
         Path: Path object pointing to the Stata data file
     """
     # Get the base path for FinScope data from the environment variable
-    base_path = Path(os.getenv("DATA_PATH"))
-    if not base_path:
-        raise ValueError("DATA_PATH environment variable is not set.")
+    base_path = get_data_path()
 
     # Construct the file path for the specific year
     file_path = base_path / "finscope" / "dta" / f"FS_{year}.dta"
@@ -47,6 +65,9 @@ def load_finscope_data(year):
     if not file_path.exists():
         raise FileNotFoundError(f"FinScope data file for {year} not found at: {file_path}")
     
+    # pyreadstat pulls in pandas, so only import it once a file is actually read
+    import pyreadstat
+
     try:
         # Load the Stata file with pyreadstat to get both data and metadata
         data, metadata = pyreadstat.read_dta(str(file_path))
@@ -73,15 +94,13 @@ def load_finscope_sav(year):
     Raises:
         FileNotFoundError: If the .sav data file for the specified year doesn't exist
     """
-    base_path = Path(os.getenv("DATA_PATH"))
-    if not base_path:
-        raise ValueError("DATA_PATH environment variable is not set.")
-
-    file_path = base_path / "finscope" / "sav" / f"FS_{year}.sav"
+    file_path = get_data_path() / "finscope" / "sav" / f"FS_{year}.sav"
 
     if not file_path.exists():
         raise FileNotFoundError(f"FinScope .sav data file for {year} not found at: {file_path}")
 
+    import pyreadstat
+
     try:
         data, metadata = pyreadstat.read_sav(str(file_path))
         print(f"Successfully loaded FinScope {year} .sav data: {len(data)} rows")